@@ -1,18 +1,53 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 from google import genai
+from google.genai import types
 from PIL import Image
 from io import BytesIO
 from pathlib import Path
-from typing import List, Optional
-from flask import Flask, request, jsonify, send_file
+from typing import Dict, List, Optional, Tuple
+from flask import Flask, request, jsonify, send_file, send_from_directory
+from werkzeug.exceptions import NotFound
+import functools
+import hashlib
+import mimetypes
 import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from database import ClosetDatabase
+from cache import CacheMissError, ResponseCache, make_cache_key
+from rate_limiter import TokenBucket, estimate_tokens
 
 
+# Route log records through a queue so request threads never block on log I/O
+log_queue: queue.Queue = queue.Queue(-1)
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(
+    logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+)
+log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+
+# Attach the QueueHandler directly; basicConfig would give it a formatter too
+# and every record would be formatted twice
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logger = logging.getLogger(__name__)
+
 # Initialize Flask app
 app = Flask(__name__)
 app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16MB max file size
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 3600  # Cache served images for an hour
 
 # Initialize folders
 INPUT_FOLDER = Path("images/input")
@@ -20,9 +55,84 @@ OUTPUT_FOLDER = Path("images/output")
 ARCHIVE_FOLDER = Path("images/archive")
 OUTFITS_FOLDER = Path("images/outfits")
 
+# Magic bytes at the start of every PNG file
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Processed images named "<sha256 prefix> - <article>.png" never change content
+CONTENT_ADDRESSED_FILENAME = re.compile(r"^([0-9a-f]{16}) - ")
+
+# File extensions accepted for uploads
+SUPPORTED_IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg"})
+
+# Gemini model used for image processing and outfit generation
+GEMINI_MODEL = "gemini-2.5-flash-image-preview"
+
+# Gemini only supports explicit context caching for prompts of at least this
+# many tokens; shorter prompts rely on implicit prefix caching instead
+EXPLICIT_CACHE_MIN_TOKENS = 2048
+EXPLICIT_CACHE_TTL_SECONDS = 600
+
+# Maximum number of concurrent Gemini requests across the whole process
+BATCH_CONCURRENCY = int(os.getenv("GEMINI_CONCURRENCY", "4"))
+gemini_slots = threading.BoundedSemaphore(BATCH_CONCURRENCY)
+
 # Initialize database
 db = ClosetDatabase()
 
+# Initialize Gemini response cache
+response_cache = ResponseCache(mode=os.getenv("GEMINI_CACHE_MODE", "enabled"))
+
+# Client-side rate limit for Gemini calls (0 disables a limit)
+rate_limiter = TokenBucket(
+    rpm=int(os.getenv("GEMINI_RPM", "0")), tpm=int(os.getenv("GEMINI_TPM", "0"))
+)
+
+# Short-lived cache of the /list-processed payload: (expiry, payload)
+LISTING_CACHE_TTL_SECONDS = 2
+_listing_cache: Optional[Tuple[float, dict]] = None
+_listing_cache_lock = threading.Lock()
+# Bumped on every invalidation so a listing built from older data is not stored
+_listing_generation = 0
+
+# Uploads currently being processed, keyed by output filename, so duplicate
+# uploads share one AI call
+_in_flight: Dict[str, Future] = {}
+_in_flight_lock = threading.Lock()
+
+# Background workers for queued /process jobs, keyed by job ID
+job_executor = ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY)
+jobs: Dict[str, Future] = {}
+jobs_lock = threading.Lock()
+
+# Finished jobs that are never polled are dropped after this long
+JOB_RESULT_TTL_SECONDS = 15 * 60
+job_finished_at: Dict[str, float] = {}
+
+
+def mark_job_finished(job_id: str) -> None:
+    """
+    Record when a queued job finished so its result can expire.
+
+    Args:
+        job_id: ID of the finished job
+    """
+    with jobs_lock:
+        if job_id in jobs:
+            job_finished_at[job_id] = time.monotonic()
+
+
+def expire_finished_jobs() -> None:
+    """
+    Forget finished jobs whose result has not been fetched within the TTL.
+
+    Must be called with jobs_lock held.
+    """
+    cutoff = time.monotonic() - JOB_RESULT_TTL_SECONDS
+    for job_id, finished_at in list(job_finished_at.items()):
+        if finished_at < cutoff:
+            del job_finished_at[job_id]
+            jobs.pop(job_id, None)
+
 
 def assure_folders_exist(*folders: List[Path]) -> None:
     """
@@ -32,6 +142,64 @@ def assure_folders_exist(*folders: List[Path]) -> None:
         folder.mkdir(parents=True, exist_ok=True)
 
 
+def guess_image_mime_type(image_path: Path) -> str:
+    """
+    Guess the MIME type of an image from its file extension.
+
+    Args:
+        image_path: Path to the image
+
+    Returns:
+        MIME type of the image, defaulting to JPEG
+    """
+    return mimetypes.guess_type(str(image_path))[0] or "image/jpeg"
+
+
+def save_image_bytes(
+    data: bytes, output_path: Path, mime_type: Optional[str] = None
+) -> None:
+    """
+    Save image bytes returned by the AI model to disk.
+
+    If the bytes are already in the output file's format they are written
+    as-is, skipping a decode and re-encode. When no MIME type is given, PNG
+    data is recognised by its signature. Otherwise the image is converted
+    with PIL, closing the buffer and decoded image as soon as the file is
+    written so long-running workers do not accumulate image memory.
+
+    The image is written to a temporary file in the same folder and renamed
+    into place, so concurrent writers and readers never see a partial file.
+
+    Args:
+        data: Encoded image bytes
+        output_path: Path to save the image to
+        mime_type: MIME type of the encoded bytes, if known
+    """
+    if mime_type is None and data.startswith(PNG_SIGNATURE):
+        mime_type = "image/png"
+
+    fd, temp_name = tempfile.mkstemp(
+        dir=output_path.parent, prefix=f".{output_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            if mime_type and mime_type == mimetypes.guess_type(str(output_path))[0]:
+                temp_file.write(data)
+            else:
+                with BytesIO(data) as buffer, Image.open(buffer) as image:
+                    image.load()
+                    image.save(
+                        temp_file,
+                        format=Image.registered_extensions()[
+                            output_path.suffix.lower()
+                        ],
+                    )
+        os.replace(temp_name, output_path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
 def initialize_app():
     """Initialize the application with existing images."""
     # Ensure folders exist
@@ -41,60 +209,204 @@ def initialize_app():
     try:
         added_count = db.populate_existing_images(OUTPUT_FOLDER)
         if added_count > 0:
-            logging.info(f"Populated database with {added_count} existing images")
+            logger.info(f"Populated database with {added_count} existing images")
         else:
-            logging.info("No new images found to populate")
+            logger.info("No new images found to populate")
     except Exception as e:
-        logging.error(f"Error populating existing images: {e}")
+        logger.error(f"Error populating existing images: {e}")
 
 
 # Initialize the app
 initialize_app()
 
+# Shared Gemini client, created lazily on first use
+_client: Optional[genai.Client] = None
+_client_lock = threading.Lock()
+
 
-def process_image_with_ai(image_path: Path, article: str) -> Optional[Path]:
+def get_client() -> Optional[genai.Client]:
     """
-    Process a single image with AI to extract the clothing article.
+    Get the shared Gemini client, creating it on first use.
+
+    Reusing one client keeps its HTTP connections alive across requests
+    instead of paying for a new TLS handshake on every call.
+
+    Returns:
+        Gemini API client, or None if GEMINI_API_KEY is not set
+    """
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    return None
+                _client = genai.Client(api_key=api_key)
+
+    return _client
+
+
+@functools.lru_cache(maxsize=256)
+def build_prompt(article: str) -> str:
+    """
+    Build the extraction prompt for a clothing article.
 
     Args:
-        image_path: Path to the input image
         article: Type of clothing article to extract
 
     Returns:
-        Path to the processed image or None if processing failed
+        Prompt text asking the model to isolate the article
+    """
+    return f"I'm going to send you a picture of a {article}, i want you to remove the rest of the image and only show the {article}. Remove any people, pets, or other objects that are not the {article}. I'm trying to make an app that will show all the things in your closet. If you can't find the article, don't return an image."
+
+
+@functools.lru_cache(maxsize=256)
+def build_outfit_prompt(item_count: int, clothing_items: str) -> str:
+    """
+    Build the outfit generation prompt.
+
+    Args:
+        item_count: Number of clothing item images sent with the prompt
+        clothing_items: Comma separated clothing categories
+
+    Returns:
+        Prompt text asking the model to dress a person in the items
+    """
+    return f"""I'm going to send you {item_count} images of individual clothing items: {clothing_items}. 
+        
+        Please create a single image showing a complete outfit on a 150 lb, 5'10" white male in his mid-20s wearing all these clothing items together. 
+        
+        The outfit should look stylish and well-coordinated. Make sure the person is wearing all the items in a natural, realistic way. 
+        The image should be a full-body shot showing the complete outfit.
+        
+        If any of the clothing items don't make sense together or can't be worn as a complete outfit, please create the best possible combination and note any issues."""
+
+
+# Explicit context caches keyed by prompt: (cache name, expiry timestamp)
+_prompt_caches: Dict[str, Tuple[str, float]] = {}
+_prompt_caches_lock = threading.Lock()
+
+
+def get_prompt_cache_name(client: genai.Client, prompt: str) -> Optional[str]:
     """
-    # Check if Google API key is set
-    api_key = os.getenv("GEMINI_API_KEY")
-    logging.info(f"GEMINI_API_KEY: {api_key}")
-    if not api_key:
-        print("Error: GEMINI_API_KEY environment variable is not set")
+    Get a Gemini explicit context cache holding the given prompt.
+
+    The cache is created on first use and reused until it expires, so the
+    prompt tokens are only uploaded once per TTL window.
+
+    Args:
+        client: Gemini API client
+        prompt: Prompt text to cache
+
+    Returns:
+        Name of the cached content, or None if the prompt is too short to cache
+        or the cache could not be created, in which case the caller sends the
+        prompt inline
+    """
+    # Rough token estimate, avoids a count_tokens round-trip per request
+    if len(prompt) // 4 < EXPLICIT_CACHE_MIN_TOKENS:
         return None
 
-    try:
-        client = genai.Client(api_key=api_key)
-        prompt = f"I'm going to send you a picture of a {article}, i want you to remove the rest of the image and only show the {article}. Remove any people, pets, or other objects that are not the {article}. I'm trying to make an app that will show all the things in your closet. If you can't find the article, don't return an image."
+    with _prompt_caches_lock:
+        cached = _prompt_caches.get(prompt)
+    # Refresh slightly early so in-flight requests never reference an expired cache
+    if cached and cached[1] > time.time() + 30:
+        return cached[0]
 
-        image_prompt = Image.open(image_path)
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-image-preview", contents=[prompt, image_prompt]
+    # Created outside the lock so a slow or failing API call does not stall
+    # other requests; concurrent misses may each create a cache, last one wins
+    try:
+        cache = client.caches.create(
+            model=GEMINI_MODEL,
+            config=types.CreateCachedContentConfig(
+                contents=[prompt], ttl=f"{EXPLICIT_CACHE_TTL_SECONDS}s"
+            ),
         )
+    except Exception as e:
+        logger.warning(f"Failed to create prompt cache, sending prompt inline: {e}")
+        return None
+
+    with _prompt_caches_lock:
+        _prompt_caches[prompt] = (cache.name, time.time() + EXPLICIT_CACHE_TTL_SECONDS)
+    return cache.name
+
+
+def process_image_with_ai(
+    image_bytes: bytes, mime_type: str, article: str, stem: str
+) -> Optional[Path]:
+    """
+    Process a single image with AI to extract the clothing article.
+
+    Args:
+        image_bytes: Encoded bytes of the input image
+        mime_type: MIME type of the input image
+        article: Type of clothing article to extract
+        stem: Base name for the output file
+
+    Returns:
+        Path to the processed image or None if processing failed
+
+    Raises:
+        CacheMissError: If the response cache is in replay mode and has no entry
+    """
+    try:
+        prompt = build_prompt(article)
+        new_file_name = f"{stem} - {article}.png"
+        output_path = OUTPUT_FOLDER / new_file_name
+
+        # Serve repeated requests from the response cache
+        cache_key = make_cache_key(GEMINI_MODEL, prompt, article, image_bytes)
+        cached_bytes = response_cache.get(cache_key)
+        if cached_bytes is not None:
+            logger.info(f"Using cached response for {stem}")
+            save_image_bytes(cached_bytes, output_path)
+            return output_path
+
+        # Check if Google API key is set
+        client = get_client()
+        if client is None:
+            logger.error("GEMINI_API_KEY environment variable is not set")
+            return None
+
+        # Send the original compressed bytes instead of decoding through PIL
+        image_prompt = types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
+
+        # Reference the prompt from an explicit cache when it is large enough,
+        # otherwise keep it first in contents so implicit caching can match it
+        cache_name = get_prompt_cache_name(client, prompt)
+        rate_limiter.acquire(estimate_tokens(prompt, len(image_bytes)))
+        with gemini_slots:
+            if cache_name:
+                response = client.models.generate_content(
+                    model=GEMINI_MODEL,
+                    contents=[image_prompt],
+                    config=types.GenerateContentConfig(cached_content=cache_name),
+                )
+            else:
+                response = client.models.generate_content(
+                    model=GEMINI_MODEL, contents=[prompt, image_prompt]
+                )
 
         if not response.candidates or not response.candidates[0].content.parts:
-            print("No content generated by AI model")
+            logger.error("No content generated by AI model")
             return None
 
         for part in response.candidates[0].content.parts:
             if part.inline_data is not None:
-                image = Image.open(BytesIO(part.inline_data.data))
-                new_file_name = f"{image_path.stem} - {article}.png"
-                output_path = OUTPUT_FOLDER / new_file_name
-                image.save(output_path)
+                save_image_bytes(
+                    part.inline_data.data, output_path, part.inline_data.mime_type
+                )
+                response_cache.set(cache_key, part.inline_data.data)
                 return output_path
 
-        print("No image data found in AI response")
+        logger.error("No image data found in AI response")
         return None
+    except CacheMissError:
+        # A replay miss is not a model failure; let the caller report it
+        raise
     except Exception as e:
-        print(f"Error processing image {image_path}: {e}")
+        logger.error(f"Error processing image {stem}: {e}")
         return None
 
 
@@ -111,62 +423,112 @@ def generate_outfit_with_ai(
     Returns:
         Path to the generated outfit image or None if generation failed
     """
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        logging.error("GEMINI_API_KEY environment variable is not set")
+    client = get_client()
+    if client is None:
+        logger.error("GEMINI_API_KEY environment variable is not set")
         return None
 
     try:
-        client = genai.Client(api_key=api_key)
-
         # Create a detailed prompt for outfit generation
         clothing_items = ", ".join(categories)
-        prompt = f"""I'm going to send you {len(image_paths)} images of individual clothing items: {clothing_items}. 
-        
-        Please create a single image showing a complete outfit on a 150 lb, 5'10" white male in his mid-20s wearing all these clothing items together. 
-        
-        The outfit should look stylish and well-coordinated. Make sure the person is wearing all the items in a natural, realistic way. 
-        The image should be a full-body shot showing the complete outfit.
-        
-        If any of the clothing items don't make sense together or can't be worn as a complete outfit, please create the best possible combination and note any issues."""
+        prompt = build_outfit_prompt(len(image_paths), clothing_items)
 
         # Load all images
         images = []
         for image_path in image_paths:
             if image_path.exists():
-                images.append(Image.open(image_path))
+                images.append(
+                    types.Part.from_bytes(
+                        data=image_path.read_bytes(),
+                        mime_type=guess_image_mime_type(image_path),
+                    )
+                )
             else:
-                logging.warning(f"Image not found: {image_path}")
+                logger.warning(f"Image not found: {image_path}")
 
         if not images:
-            logging.error("No valid images found for outfit generation")
+            logger.error("No valid images found for outfit generation")
             return None
 
         # Generate the outfit
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-image-preview", contents=[prompt] + images
+        rate_limiter.acquire(
+            estimate_tokens(
+                prompt, sum(len(image.inline_data.data) for image in images)
+            )
         )
+        with gemini_slots:
+            response = client.models.generate_content(
+                model=GEMINI_MODEL, contents=[prompt] + images
+            )
 
         if not response.candidates or not response.candidates[0].content.parts:
-            logging.error("No content generated by AI model for outfit")
+            logger.error("No content generated by AI model for outfit")
             return None
 
         for part in response.candidates[0].content.parts:
             if part.inline_data is not None:
-                outfit_image = Image.open(BytesIO(part.inline_data.data))
                 outfit_filename = f"outfit_{uuid.uuid4()}.png"
                 outfit_path = OUTFITS_FOLDER / outfit_filename
-                outfit_image.save(outfit_path)
+                save_image_bytes(
+                    part.inline_data.data, outfit_path, part.inline_data.mime_type
+                )
                 return outfit_path
 
-        logging.error("No image data found in AI response for outfit")
+        logger.error("No image data found in AI response for outfit")
         return None
 
     except Exception as e:
-        logging.error(f"Error generating outfit: {e}")
+        logger.error(f"Error generating outfit: {e}")
         return None
 
 
+def record_processed_image(result_path: Path, article: str) -> int:
+    """
+    Save a processed image to the database and tag it with its category.
+
+    Args:
+        result_path: Path to the processed image
+        article: Type of clothing article that was extracted
+
+    Returns:
+        ID of the created image record
+    """
+    image_id = db.add_image(
+        filename=result_path.name,
+        file_path=str(result_path),
+        description=None,  # Will be manually reviewed later
+    )
+
+    category_id = db.add_category(name=article)
+    db.assign_category_to_image(image_id, category_id)
+
+    invalidate_listing_cache()
+
+    return image_id
+
+
+def invalidate_listing_cache() -> None:
+    """Drop the cached /list-processed payload so the next request rebuilds it."""
+    global _listing_cache, _listing_generation
+
+    with _listing_cache_lock:
+        _listing_cache = None
+        _listing_generation += 1
+
+
+def is_supported_image(filename: str) -> bool:
+    """
+    Check whether an uploaded file has a supported image extension.
+
+    Args:
+        filename: Name of the uploaded file
+
+    Returns:
+        True if the file is a PNG, JPG, or JPEG image
+    """
+    return os.path.splitext(filename)[1].lower() in SUPPORTED_IMAGE_EXTENSIONS
+
+
 @app.route("/health", methods=["GET"])
 def health_check() -> dict:
     """
@@ -178,6 +540,111 @@ def health_check() -> dict:
     return jsonify({"status": "healthy", "message": "Closet API is running"})
 
 
+def produce_output(
+    image_bytes: bytes, mime_type: str, article: str, stem: str, output_path: Path
+) -> Tuple[Optional[Path], bool]:
+    """
+    Get the processed image for an upload, calling the AI model at most once.
+
+    An existing output file is reused. Concurrent uploads of the same image
+    and article wait for the request already processing it instead of making
+    their own API call.
+
+    Args:
+        image_bytes: Encoded bytes of the uploaded image
+        mime_type: MIME type of the uploaded image
+        article: Type of clothing article to extract
+        stem: Base name for the output file
+        output_path: Path the processed image is saved to
+
+    Returns:
+        Tuple of the processed image path (or None if processing failed) and
+        whether an earlier or concurrent request produced it
+    """
+    with _in_flight_lock:
+        if output_path.exists():
+            return output_path, True
+        future = _in_flight.get(output_path.name)
+        owner = future is None
+        if owner:
+            future = _in_flight[output_path.name] = Future()
+
+    if not owner:
+        return future.result(), True
+
+    try:
+        result_path = process_image_with_ai(image_bytes, mime_type, article, stem)
+        future.set_result(result_path)
+        return result_path, False
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            del _in_flight[output_path.name]
+
+
+def process_upload(
+    image_bytes: bytes, mime_type: str, article: str
+) -> Tuple[dict, int]:
+    """
+    Process an uploaded image and record the result in the database.
+
+    Output files are named after a hash of the upload, so an image that was
+    already processed for the same article is returned without calling the
+    AI model again. Returns plain data rather than a Flask response so it can
+    also run on a background worker.
+
+    Args:
+        image_bytes: Encoded bytes of the uploaded image
+        mime_type: MIME type of the uploaded image
+        article: Type of clothing article to extract
+
+    Returns:
+        Tuple of the JSON payload and HTTP status code
+    """
+    try:
+        stem = hashlib.sha256(image_bytes).hexdigest()[:16]
+        output_path = OUTPUT_FOLDER / f"{stem} - {article}.png"
+
+        result_path, cached = produce_output(
+            image_bytes, mime_type, article, stem, output_path
+        )
+
+        if result_path and result_path.exists():
+            # Save image to database unless it is already recorded
+            existing = db.get_image_by_filename(result_path.name)
+            if existing:
+                image_id = existing["id"]
+            else:
+                try:
+                    image_id = record_processed_image(result_path, article)
+                except sqlite3.IntegrityError:
+                    # A concurrent upload of the same image recorded it first
+                    image_id = db.get_image_by_filename(result_path.name)["id"]
+
+            return {
+                "success": True,
+                "cached": cached,
+                "message": f"Successfully processed {article}",
+                "output_file": result_path.name,
+                "download_url": f"/download/{result_path.name}",
+                "image_url": f"/images/{result_path.name}",
+                "image_id": image_id,
+                "category": article,
+            }, 200
+        else:
+            return {
+                "success": False,
+                "message": f"Could not extract {article} from the image",
+            }, 400
+
+    except CacheMissError as e:
+        return {"success": False, "error": f"Response cache miss: {str(e)}"}, 500
+    except Exception as e:
+        return {"success": False, "error": f"Processing failed: {str(e)}"}, 500
+
+
 @app.route("/process", methods=["POST"])
 def process_image() -> dict:
     """
@@ -187,6 +654,10 @@ def process_image() -> dict:
         - file: Image file to process
         - article: Type of clothing article to extract
 
+    Query parameters:
+        - async: If true, queue the image on a background worker and return
+          202 with a job ID to poll via /status/<job_id>
+
     Returns:
         JSON response with processing results
     """
@@ -202,62 +673,148 @@ def process_image() -> dict:
     if file.filename == "":
         return jsonify({"error": "No file selected"}), 400
 
-    if not file.filename.lower().endswith((".png", ".jpg", ".jpeg")):
+    if not is_supported_image(file.filename):
         return jsonify(
             {"error": "Invalid file type. Only PNG, JPG, and JPEG are supported"}
         ), 400
 
-    # Ensure folders exist
-    assure_folders_exist(INPUT_FOLDER, OUTPUT_FOLDER, ARCHIVE_FOLDER)
-
-    # Save uploaded file temporarily
-    filename = f"{uuid.uuid4()}_{file.filename}"
-    temp_path = INPUT_FOLDER / filename
-    file.save(temp_path)
+    # Ensure the output folder exists
+    assure_folders_exist(OUTPUT_FOLDER)
 
-    try:
-        # Process the image
-        result_path = process_image_with_ai(temp_path, article)
+    # Keep the upload in memory, it is bounded by MAX_CONTENT_LENGTH
+    image_bytes = file.read()
+    mime_type = guess_image_mime_type(Path(file.filename))
 
-        if result_path and result_path.exists():
-            # Save image to database
-            image_id = db.add_image(
-                filename=result_path.name,
-                file_path=str(result_path),
-                description=None,  # Will be manually reviewed later
+    if request.args.get("async", "").lower() in ("1", "true", "yes"):
+        job_id = str(uuid.uuid4())
+        with jobs_lock:
+            expire_finished_jobs()
+            future = jobs[job_id] = job_executor.submit(
+                process_upload, image_bytes, mime_type, article
             )
+        # Registered outside the lock: the callback runs immediately, and
+        # takes the lock itself, if the job has already finished
+        future.add_done_callback(lambda _: mark_job_finished(job_id))
 
-            # Add category to database and assign to image
-            category_id = db.add_category(name=article)
-            db.assign_category_to_image(image_id, category_id)
+        return jsonify(
+            {
+                "success": True,
+                "message": f"Queued {article} for processing",
+                "job_id": job_id,
+                "status_url": f"/status/{job_id}",
+            }
+        ), 202
 
+    payload, status = process_upload(image_bytes, mime_type, article)
+    return jsonify(payload), status
+
+
+@app.route("/status/<job_id>", methods=["GET"])
+def job_status(job_id: str):
+    """
+    Get the status of a queued image processing job.
+
+    Finished jobs are forgotten once their result has been returned, or after
+    JOB_RESULT_TTL_SECONDS if it is never fetched.
+
+    Args:
+        job_id: ID returned by /process?async=true
+
+    Returns:
+        JSON response with the job status and, once finished, its result
+    """
+    with jobs_lock:
+        expire_finished_jobs()
+        future = jobs.get(job_id)
+        if future is not None and future.done():
+            del jobs[job_id]
+            job_finished_at.pop(job_id, None)
+
+    if future is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    if not future.done():
+        return jsonify({"job_id": job_id, "status": "processing"})
+
+    payload, status = future.result()
+    return jsonify(
+        {"job_id": job_id, "status": "done" if status == 200 else "failed", **payload}
+    ), status
+
+
+@app.route("/process-batch", methods=["POST"])
+def process_batch() -> dict:
+    """
+    Process multiple uploaded images concurrently.
+
+    Gemini calls are network-bound, so images are fanned out over a bounded
+    thread pool (``GEMINI_CONCURRENCY`` workers) instead of one at a time.
+
+    Expected form data:
+        - files: Image files to process
+        - article: Type of clothing article to extract, either once for all
+          files or once per file in the same order
+
+    Returns:
+        JSON response with per-file processing results
+    """
+    files = request.files.getlist("files")
+    articles = request.form.getlist("article")
+
+    if not files:
+        return jsonify({"error": "No files provided"}), 400
+
+    if not articles:
+        return jsonify({"error": "No article type provided"}), 400
+
+    if len(articles) == 1:
+        articles = articles * len(files)
+    elif len(articles) != len(files):
+        return jsonify(
+            {"error": "Provide one article type, or one per uploaded file"}
+        ), 400
+
+    for file in files:
+        if file.filename == "":
+            return jsonify({"error": "No file selected"}), 400
+        if not is_supported_image(file.filename):
             return jsonify(
                 {
-                    "success": True,
-                    "message": f"Successfully processed {article}",
-                    "output_file": result_path.name,
-                    "download_url": f"/download/{result_path.name}",
-                    "image_url": f"/images/{result_path.name}",
-                    "image_id": image_id,
-                    "category": article,
-                }
-            )
-        else:
-            return jsonify(
-                {
-                    "success": False,
-                    "message": f"Could not extract {article} from the image",
+                    "error": f"Invalid file type for {file.filename}. Only PNG, JPG, and JPEG are supported"
                 }
             ), 400
 
+    # Ensure the output folder exists
+    assure_folders_exist(OUTPUT_FOLDER)
+
+    # Keep the uploads in memory, they are bounded by MAX_CONTENT_LENGTH
+    images = [file.read() for file in files]
+    mime_types = [guess_image_mime_type(Path(file.filename)) for file in files]
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=min(BATCH_CONCURRENCY, len(images))
+        ) as executor:
+            outcomes = list(executor.map(process_upload, images, mime_types, articles))
+
+        results = [
+            {"filename": file.filename, **payload}
+            for file, (payload, _) in zip(files, outcomes)
+        ]
+
+        processed = sum(1 for result in results if result["success"])
+        return jsonify(
+            {
+                "success": processed > 0,
+                "message": f"Processed {processed} of {len(results)} images",
+                "results": results,
+                "count": processed,
+            }
+        )
+
     except Exception as e:
         return jsonify({"success": False, "error": f"Processing failed: {str(e)}"}), 500
 
-    finally:
-        # Clean up temporary file
-        if temp_path.exists():
-            temp_path.unlink()
-
 
 @app.route("/download/<filename>", methods=["GET"])
 def download_file(filename: str):
@@ -267,15 +824,35 @@ def download_file(filename: str):
     Args:
         filename: Name of the file to download
 
+    Content-addressed files use their hash prefix as a strong ETag and are
+    cached as immutable, so repeat downloads are answered with 304.
+
     Returns:
         The requested file or 404 if not found
     """
-    file_path = OUTPUT_FOLDER / filename
-    if file_path.exists():
-        return send_file(file_path, as_attachment=True)
-    else:
+    # Reject anything that could escape the output folder
+    if ".." in filename or "/" in filename or "\\" in filename:
+        return jsonify({"error": "File not found"}), 404
+
+    match = CONTENT_ADDRESSED_FILENAME.match(filename)
+
+    try:
+        response = send_from_directory(
+            OUTPUT_FOLDER.absolute(),
+            filename,
+            as_attachment=True,
+            conditional=True,
+            etag=match.group(1) if match else True,
+            max_age=31536000 if match else 3600,
+        )
+    except NotFound:
         return jsonify({"error": "File not found"}), 404
 
+    response.cache_control.public = True
+    if match:
+        response.cache_control.immutable = True
+    return response
+
 
 @app.route("/images/<filename>", methods=["GET"])
 def serve_image(filename: str):
@@ -300,13 +877,22 @@ def list_processed_files() -> dict:
     """
     List all processed image files from the database.
 
+    The payload is cached for a couple of seconds so bursts of gallery
+    refreshes do not each rebuild the listing from the database.
+
     Returns:
         JSON response with list of processed files including metadata
     """
-    images = db.get_all_images()
+    global _listing_cache
+
+    with _listing_cache_lock:
+        cached = _listing_cache
+        generation = _listing_generation
+    if cached and cached[0] > time.monotonic():
+        return jsonify(cached[1])
 
     files = []
-    for image in images:
+    for image in db.iter_all_images():
         files.append(
             {
                 "id": image["id"],
@@ -321,7 +907,13 @@ def list_processed_files() -> dict:
             }
         )
 
-    return jsonify({"files": files, "count": len(files)})
+    payload = {"files": files, "count": len(files)}
+    # Skip storing if an upload invalidated the cache while the payload was built
+    with _listing_cache_lock:
+        if generation == _listing_generation:
+            _listing_cache = (time.monotonic() + LISTING_CACHE_TTL_SECONDS, payload)
+
+    return jsonify(payload)
 
 
 @app.route("/outfits/<filename>", methods=["GET"])
@@ -368,10 +960,8 @@ def list_outfits() -> dict:
     Returns:
         JSON response with list of outfits including metadata
     """
-    outfits = db.get_all_outfits()
-
     outfit_list = []
-    for outfit in outfits:
+    for outfit in db.iter_all_outfits():
         outfit_list.append(
             {
                 "id": outfit["id"],
@@ -457,8 +1047,9 @@ def generate_outfit() -> dict:
             )
 
             # Link clothing items to the outfit
-            for image_data in images:
-                db.add_item_to_outfit(outfit_id, image_data["id"])
+            db.add_items_to_outfit(
+                outfit_id, [image_data["id"] for image_data in images]
+            )
 
             return jsonify(
                 {
@@ -479,13 +1070,21 @@ def generate_outfit() -> dict:
             ), 500
 
     except Exception as e:
-        logging.error(f"Error generating outfit: {e}")
+        logger.error(f"Error generating outfit: {e}")
         return jsonify(
             {"success": False, "error": f"Outfit generation failed: {str(e)}"}
         ), 500
 
 
 if __name__ == "__main__":
+    # The Werkzeug server is for development only, production runs under
+    # Gunicorn (see start.sh)
+    if os.getenv("FLASK_ENV") == "production":
+        raise SystemExit(
+            "Refusing to start the development server with FLASK_ENV=production. "
+            "Run: gunicorn --worker-class gthread --workers 1 --threads 8 "
+            "--bind 0.0.0.0:5000 app:app"
+        )
+
     # Run the Flask app
-    debug_mode = os.getenv("FLASK_ENV") != "production"
-    app.run(debug=debug_mode, host="0.0.0.0", port=5000)
+    app.run(debug=True, host="0.0.0.0", port=5000, threaded=True)
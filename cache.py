@@ -0,0 +1,148 @@
+"""
+Disk-backed response cache for Gemini API calls.
+
+Responses are stored in SQLite keyed by a SHA256 digest of everything that
+influences the model output (model name, prompt, article and image bytes), so
+repeated requests for the same input skip the network round-trip entirely.
+
+Supported cache modes:
+- enabled: read from and write to the cache
+- replay: only read from the cache; a miss raises CacheMissError
+- write-only: always call the API, but record responses
+- disabled: bypass the cache completely
+"""
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+import logging
+
+
+CACHE_MODES = ("enabled", "replay", "write-only", "disabled")
+
+
+class CacheMissError(LookupError):
+    """Raised in replay mode when a response is not in the cache."""
+
+
+def make_cache_key(model: str, prompt: str, article: str, image_bytes: bytes) -> str:
+    """
+    Build the cache key for a Gemini request.
+
+    Args:
+        model: Name of the Gemini model
+        prompt: Prompt text sent with the image
+        article: Type of clothing article to extract
+        image_bytes: Encoded bytes of the input image
+
+    Returns:
+        Hex encoded SHA256 digest identifying the request
+    """
+    digest = hashlib.sha256()
+    digest.update(model.encode())
+    digest.update(prompt.encode())
+    digest.update(article.encode())
+    digest.update(image_bytes)
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Stores Gemini response image bytes in a SQLite database."""
+
+    def __init__(self, db_path: str = "data/cache.db", mode: str = "enabled"):
+        """
+        Initialize the response cache.
+
+        Args:
+            db_path: Path to the SQLite cache file
+            mode: One of CACHE_MODES controlling reads and writes
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(
+                f"Invalid cache mode {mode!r}, expected one of {', '.join(CACHE_MODES)}"
+            )
+
+        self.db_path = db_path
+        self.mode = mode
+
+        if self.mode != "disabled":
+            self.init_cache()
+
+    def init_cache(self) -> None:
+        """Create the cache table if it does not exist."""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    part_bytes BLOB NOT NULL,
+                    created REAL NOT NULL
+                )
+            """)
+            conn.commit()
+
+    @property
+    def readable(self) -> bool:
+        """Whether lookups should consult the cache."""
+        return self.mode in ("enabled", "replay")
+
+    @property
+    def writable(self) -> bool:
+        """Whether new responses should be stored."""
+        return self.mode in ("enabled", "write-only")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_cache_key
+
+        Returns:
+            Cached response bytes, or None on a miss
+
+        Raises:
+            CacheMissError: If the cache is in replay mode and the key is missing
+        """
+        if not self.readable:
+            return None
+
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT part_bytes FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is not None:
+            return row[0]
+
+        if self.mode == "replay":
+            raise CacheMissError(f"No cached response for key {key}")
+
+        return None
+
+    def set(self, key: str, part_bytes: bytes) -> None:
+        """
+        Store a response in the cache.
+
+        Args:
+            key: Cache key from make_cache_key
+            part_bytes: Raw image bytes returned by the model
+        """
+        if not self.writable:
+            return
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO responses (key, part_bytes, created)
+                    VALUES (?, ?, ?)
+                """,
+                    (key, part_bytes, time.time()),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Failed to write response cache entry: {e}")
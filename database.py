@@ -9,12 +9,371 @@ This module defines the SQLite database schema with tables for:
 - image_tags: many-to-many relationship between images and tags
 """
 
+import json
+import os
+import queue
 import sqlite3
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Sequence, Tuple
 import logging
 
 
+# SQL statements are module-level constants so every call passes the same
+# string and hits the connection's prepared statement cache
+_SQL_INSERT_IMAGE = """
+    INSERT INTO images (filename, file_path, description)
+    VALUES (?, ?, ?)
+"""
+# Image rows with their categories and tags aggregated into JSON arrays, so
+# one statement returns fully hydrated images
+_SQL_SELECT_IMAGES = """
+    SELECT
+        images.*,
+        (
+            SELECT json_group_array(
+                json_object('id', c.id, 'name', c.name, 'description', c.description)
+            )
+            FROM categories c
+            JOIN image_categories ic ON c.id = ic.category_id
+            WHERE ic.image_id = images.id
+        ) AS categories,
+        (
+            SELECT json_group_array(json_object('id', t.id, 'name', t.name))
+            FROM tags t
+            JOIN image_tags it ON t.id = it.tag_id
+            WHERE it.image_id = images.id
+        ) AS tags
+    FROM images
+"""
+_SQL_GET_IMAGE = _SQL_SELECT_IMAGES + "WHERE images.id = ?"
+_SQL_GET_IMAGE_BY_FILENAME = _SQL_SELECT_IMAGES + "WHERE images.filename = ?"
+_SQL_GET_ALL_IMAGES = _SQL_SELECT_IMAGES + "ORDER BY images.created_at DESC"
+_SQL_SEARCH_IMAGES_BY_CATEGORY_ID = (
+    _SQL_SELECT_IMAGES
+    + """
+    JOIN image_categories search_ic ON images.id = search_ic.image_id
+    WHERE search_ic.category_id = ?
+    ORDER BY images.created_at DESC
+"""
+)
+_SQL_GET_ALL_FILENAMES = "SELECT filename FROM images"
+_SQL_UPDATE_IMAGE_DESCRIPTION = """
+    UPDATE images
+    SET description = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+_SQL_INSERT_CATEGORY = """
+    INSERT OR IGNORE INTO categories (name, description)
+    VALUES (?, ?)
+"""
+_SQL_GET_CATEGORY_ID = "SELECT id FROM categories WHERE name = ?"
+_SQL_UPSERT_CATEGORY = """
+    INSERT INTO categories (name, description)
+    VALUES (?, ?)
+    ON CONFLICT(name) DO UPDATE SET name = excluded.name
+    RETURNING id
+"""
+_SQL_GET_CATEGORIES = "SELECT * FROM categories ORDER BY name"
+_SQL_INSERT_TAG = """
+    INSERT OR IGNORE INTO tags (name)
+    VALUES (?)
+"""
+_SQL_GET_TAG_ID = "SELECT id FROM tags WHERE name = ?"
+_SQL_UPSERT_TAG = """
+    INSERT INTO tags (name)
+    VALUES (?)
+    ON CONFLICT(name) DO UPDATE SET name = excluded.name
+    RETURNING id
+"""
+_SQL_GET_TAGS = "SELECT * FROM tags ORDER BY name"
+_SQL_DATA_VERSION = "PRAGMA data_version"
+_SQL_ASSIGN_CATEGORY = """
+    INSERT OR IGNORE INTO image_categories (image_id, category_id)
+    VALUES (?, ?)
+"""
+_SQL_ASSIGN_TAG = """
+    INSERT OR IGNORE INTO image_tags (image_id, tag_id)
+    VALUES (?, ?)
+"""
+_SQL_INSERT_OUTFIT = """
+    INSERT INTO outfits (filename, file_path, description)
+    VALUES (?, ?, ?)
+"""
+_SQL_GET_OUTFIT = "SELECT * FROM outfits WHERE id = ?"
+_SQL_GET_ALL_OUTFITS = "SELECT * FROM outfits ORDER BY created_at DESC"
+_SQL_OUTFIT_ITEMS = """
+    SELECT oi.outfit_id, i.id, i.filename, i.file_path, i.description, i.created_at
+    FROM images i
+    JOIN outfit_items oi ON i.id = oi.image_id
+    {where}
+    ORDER BY i.created_at
+"""
+_SQL_ADD_OUTFIT_ITEM = """
+    INSERT OR IGNORE INTO outfit_items (outfit_id, image_id)
+    VALUES (?, ?)
+"""
+_SQL_REMOVE_OUTFIT_ITEM = """
+    DELETE FROM outfit_items
+    WHERE outfit_id = ? AND image_id = ?
+"""
+_SQL_UPDATE_OUTFIT_DESCRIPTION = """
+    UPDATE outfits
+    SET description = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+# Read-only connections kept open for concurrent readers
+READ_POOL_SIZE = 4
+
+# Per-connection tuning shared by the writer and the read-only connections
+_CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+# Bump when tables or indexes change and add the upgrade script to _MIGRATIONS
+SCHEMA_VERSION = 2
+
+# Schema version 1: the original tables and indexes
+_SCHEMA_V1 = """
+    -- Create images table
+    CREATE TABLE IF NOT EXISTS images (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        filename TEXT NOT NULL UNIQUE,
+        file_path TEXT NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Create categories table
+    CREATE TABLE IF NOT EXISTS categories (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Create tags table
+    CREATE TABLE IF NOT EXISTS tags (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Create image_categories join table (many-to-many)
+    CREATE TABLE IF NOT EXISTS image_categories (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        image_id INTEGER NOT NULL,
+        category_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (image_id) REFERENCES images (id) ON DELETE CASCADE,
+        FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE CASCADE,
+        UNIQUE(image_id, category_id)
+    );
+
+    -- Create image_tags join table (many-to-many)
+    CREATE TABLE IF NOT EXISTS image_tags (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        image_id INTEGER NOT NULL,
+        tag_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (image_id) REFERENCES images (id) ON DELETE CASCADE,
+        FOREIGN KEY (tag_id) REFERENCES tags (id) ON DELETE CASCADE,
+        UNIQUE(image_id, tag_id)
+    );
+
+    -- Create outfits table
+    CREATE TABLE IF NOT EXISTS outfits (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        filename TEXT NOT NULL UNIQUE,
+        file_path TEXT NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    -- Create outfit_items table (many-to-many between outfits and clothing items)
+    CREATE TABLE IF NOT EXISTS outfit_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        outfit_id INTEGER NOT NULL,
+        image_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (outfit_id) REFERENCES outfits (id) ON DELETE CASCADE,
+        FOREIGN KEY (image_id) REFERENCES images (id) ON DELETE CASCADE,
+        UNIQUE(outfit_id, image_id)
+    );
+
+    -- Create indexes for better performance
+    CREATE INDEX IF NOT EXISTS idx_images_filename ON images(filename);
+    CREATE INDEX IF NOT EXISTS idx_categories_name ON categories(name);
+    CREATE INDEX IF NOT EXISTS idx_tags_name ON tags(name);
+    CREATE INDEX IF NOT EXISTS idx_image_categories_image_id
+        ON image_categories(image_id);
+    CREATE INDEX IF NOT EXISTS idx_image_categories_category_id
+        ON image_categories(category_id);
+    CREATE INDEX IF NOT EXISTS idx_image_tags_image_id ON image_tags(image_id);
+    CREATE INDEX IF NOT EXISTS idx_image_tags_tag_id ON image_tags(tag_id);
+    CREATE INDEX IF NOT EXISTS idx_outfits_filename ON outfits(filename);
+    CREATE INDEX IF NOT EXISTS idx_outfit_items_outfit_id ON outfit_items(outfit_id);
+    CREATE INDEX IF NOT EXISTS idx_outfit_items_image_id ON outfit_items(image_id);
+
+    -- Covering indexes for looking up images by category or tag; the UNIQUE
+    -- constraints already cover lookups by image_id
+    CREATE INDEX IF NOT EXISTS idx_ic_category_image
+        ON image_categories(category_id, image_id);
+    CREATE INDEX IF NOT EXISTS idx_it_tag_image ON image_tags(tag_id, image_id);
+    CREATE INDEX IF NOT EXISTS idx_images_created_at ON images(created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_outfits_created_at ON outfits(created_at DESC);
+"""
+
+# Schema version 2: join tables drop their surrogate id and become WITHOUT
+# ROWID tables keyed on their foreign key pair, so each row is stored once in
+# the primary key b-tree instead of a rowid table plus a UNIQUE index
+_SCHEMA_V2 = """
+    CREATE TABLE image_categories_new (
+        image_id INTEGER NOT NULL,
+        category_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (image_id) REFERENCES images (id) ON DELETE CASCADE,
+        FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE CASCADE,
+        PRIMARY KEY (image_id, category_id)
+    ) WITHOUT ROWID;
+    INSERT INTO image_categories_new (image_id, category_id, created_at)
+        SELECT image_id, category_id, created_at FROM image_categories;
+    DROP TABLE image_categories;
+    ALTER TABLE image_categories_new RENAME TO image_categories;
+
+    CREATE TABLE image_tags_new (
+        image_id INTEGER NOT NULL,
+        tag_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (image_id) REFERENCES images (id) ON DELETE CASCADE,
+        FOREIGN KEY (tag_id) REFERENCES tags (id) ON DELETE CASCADE,
+        PRIMARY KEY (image_id, tag_id)
+    ) WITHOUT ROWID;
+    INSERT INTO image_tags_new (image_id, tag_id, created_at)
+        SELECT image_id, tag_id, created_at FROM image_tags;
+    DROP TABLE image_tags;
+    ALTER TABLE image_tags_new RENAME TO image_tags;
+
+    CREATE TABLE outfit_items_new (
+        outfit_id INTEGER NOT NULL,
+        image_id INTEGER NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (outfit_id) REFERENCES outfits (id) ON DELETE CASCADE,
+        FOREIGN KEY (image_id) REFERENCES images (id) ON DELETE CASCADE,
+        PRIMARY KEY (outfit_id, image_id)
+    ) WITHOUT ROWID;
+    INSERT INTO outfit_items_new (outfit_id, image_id, created_at)
+        SELECT outfit_id, image_id, created_at FROM outfit_items;
+    DROP TABLE outfit_items;
+    ALTER TABLE outfit_items_new RENAME TO outfit_items;
+
+    DELETE FROM sqlite_sequence
+        WHERE name IN ('image_categories', 'image_tags', 'outfit_items');
+
+    -- Dropping the old tables also dropped their indexes. The primary keys
+    -- cover lookups by image or outfit; these cover the reverse direction
+    CREATE INDEX idx_ic_category_image ON image_categories(category_id, image_id);
+    CREATE INDEX idx_it_tag_image ON image_tags(tag_id, image_id);
+    CREATE INDEX idx_outfit_items_image_id ON outfit_items(image_id, outfit_id);
+"""
+
+# Upgrade script for each schema version, applied in order by init_database
+_MIGRATIONS = {1: _SCHEMA_V1, 2: _SCHEMA_V2}
+
+# RETURNING needs SQLite 3.35+; older libraries fall back to INSERT then SELECT
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def _id_filter(column: str, ids: Optional[List[int]]) -> Tuple[str, tuple]:
+    """
+    Build an optional ``WHERE column IN (...)`` clause.
+
+    Args:
+        column: Column to filter on
+        ids: IDs to match, or None to match every row
+
+    Returns:
+        Tuple of the SQL clause and its parameters
+    """
+    if ids is None:
+        return "", ()
+    placeholders = ", ".join("?" * len(ids))
+    return f"WHERE {column} IN ({placeholders})", tuple(ids)
+
+
+def _split_statements(script: str) -> Iterator[str]:
+    """
+    Split an SQL script into its individual statements.
+
+    ``executescript`` would commit the surrounding transaction first, so
+    scripts that must run inside one are executed statement by statement.
+
+    Args:
+        script: SQL statements separated by semicolons
+
+    Yields:
+        Each complete statement, including any leading comments
+    """
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ""
+
+
+def _image_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+    """
+    Convert a row from _SQL_SELECT_IMAGES into an image dictionary.
+
+    Args:
+        row: Image row with JSON encoded ``categories`` and ``tags`` columns
+
+    Returns:
+        Dictionary containing image data with categories and tags
+    """
+    image = dict(row)
+    image["categories"] = json.loads(image["categories"])
+    image["tags"] = json.loads(image["tags"])
+    return image
+
+
+def _fetch_grouped(
+    conn: sqlite3.Connection, sql: str, params: Iterable[Any] = ()
+) -> Dict[Any, List[Dict[str, Any]]]:
+    """
+    Run a query and group its rows into dictionaries keyed by the first column.
+
+    Rows are fetched as plain tuples and the column names are read once from
+    the cursor description, instead of building a ``sqlite3.Row`` and asking
+    it for its keys on every row.
+
+    Args:
+        conn: Connection to run the query on
+        sql: SELECT statement whose first column is the grouping key
+        params: Parameters for the statement
+
+    Returns:
+        Mapping of key to the remaining columns of each matching row
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+
+    names = [column[0] for column in cursor.description[1:]]
+    grouped = defaultdict(list)
+    for key, *values in cursor:
+        grouped[key].append(dict(zip(names, values)))
+    return grouped
+
+
 class ClosetDatabase:
     """Manages the SQLite database for the closet application."""
 
@@ -26,131 +385,167 @@ class ClosetDatabase:
             db_path: Path to the SQLite database file
         """
         self.db_path = db_path
-        self.init_database()
 
-    def init_database(self) -> None:
-        """Initialize the database with required tables."""
         # Ensure the data directory exists
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
+        # One long-lived connection in autocommit mode; writes open explicit
+        # transactions through _transaction()
+        self._conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+
+        # Small reference tables (categories, tags) keyed by their SELECT,
+        # mapped to the data_version they were read at and their rows
+        self._reference_cache: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
+
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for pragma in _CONNECTION_PRAGMAS:
+            self._conn.execute(pragma)
 
-            # Create images table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS images (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    filename TEXT NOT NULL UNIQUE,
-                    file_path TEXT NOT NULL,
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Create categories table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Create tags table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS tags (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Create image_categories join table (many-to-many)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS image_categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    image_id INTEGER NOT NULL,
-                    category_id INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (image_id) REFERENCES images (id) ON DELETE CASCADE,
-                    FOREIGN KEY (category_id) REFERENCES categories (id) ON DELETE CASCADE,
-                    UNIQUE(image_id, category_id)
-                )
-            """)
-
-            # Create image_tags join table (many-to-many)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS image_tags (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    image_id INTEGER NOT NULL,
-                    tag_id INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (image_id) REFERENCES images (id) ON DELETE CASCADE,
-                    FOREIGN KEY (tag_id) REFERENCES tags (id) ON DELETE CASCADE,
-                    UNIQUE(image_id, tag_id)
-                )
-            """)
-
-            # Create outfits table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS outfits (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    filename TEXT NOT NULL UNIQUE,
-                    file_path TEXT NOT NULL,
-                    description TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # Create outfit_items table (many-to-many relationship between outfits and clothing items)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS outfit_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    outfit_id INTEGER NOT NULL,
-                    image_id INTEGER NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (outfit_id) REFERENCES outfits (id) ON DELETE CASCADE,
-                    FOREIGN KEY (image_id) REFERENCES images (id) ON DELETE CASCADE,
-                    UNIQUE(outfit_id, image_id)
-                )
-            """)
-
-            # Create indexes for better performance
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_images_filename ON images(filename)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_categories_name ON categories(name)"
-            )
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tags_name ON tags(name)")
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_image_categories_image_id ON image_categories(image_id)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_image_categories_category_id ON image_categories(category_id)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_image_tags_image_id ON image_tags(image_id)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_image_tags_tag_id ON image_tags(tag_id)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_outfits_filename ON outfits(filename)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_outfit_items_outfit_id ON outfit_items(outfit_id)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_outfit_items_image_id ON outfit_items(image_id)"
-            )
+        self.init_database()
+
+        # In WAL mode readers on their own connections neither block each
+        # other nor wait for the writer
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        for _ in range(READ_POOL_SIZE):
+            self._readers.put(self._connect_reader())
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        """
+        Open a read-only connection to the database.
+
+        Returns:
+            Connection in autocommit mode with ``sqlite3.Row`` rows
+        """
+        conn = sqlite3.connect(
+            f"{Path(self.db_path).resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Run the enclosed statements in a single write transaction.
+
+        Commits on success and rolls back if an exception escapes.
+
+        Args:
+            immediate: Take the database write lock when the transaction starts
+                rather than at its first write
+
+        Yields:
+            The shared database connection
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a read-only connection from the pool.
+
+        Blocks while every pooled connection is in use.
+
+        Yields:
+            A read-only database connection
+        """
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _cached_rows(self, sql: str) -> List[Dict[str, Any]]:
+        """
+        Run a reference-data query, reusing the previous result when possible.
+
+        ``PRAGMA data_version`` on the writer connection changes whenever
+        another connection commits, so writes from other processes invalidate
+        the cache as well. Writes through the writer connection must drop the
+        entry themselves. The query runs on the writer connection under its
+        lock so it cannot race with that invalidation.
+
+        Args:
+            sql: SELECT statement to run
+
+        Returns:
+            List of row dictionaries, shared between callers
+        """
+        with self._lock:
+            data_version = self._conn.execute(_SQL_DATA_VERSION).fetchone()[0]
+            cached = self._reference_cache.get(sql)
+            if cached is not None and cached[0] == data_version:
+                return cached[1]
+
+            rows = [dict(row) for row in self._conn.execute(sql)]
+            self._reference_cache[sql] = (data_version, rows)
+            return rows
+
+    def close(self) -> None:
+        """Close the writer and all pooled read-only connections."""
+        for _ in range(READ_POOL_SIZE):
+            self._readers.get().close()
+        with self._lock:
+            self._conn.close()
+
+    def init_database(self) -> None:
+        """
+        Initialize the database with required tables.
+
+        The schema version is stored in ``PRAGMA user_version`` so an up to
+        date database skips the DDL entirely. Otherwise every pending step in
+        _MIGRATIONS runs inside a single IMMEDIATE transaction.
+        """
+        with self._lock:
+            if self._schema_version() >= SCHEMA_VERSION:
+                return
+
+            with self._transaction(immediate=True) as conn:
+                # Re-read under the write lock: another process starting at the
+                # same time may have upgraded the schema while we waited
+                version = self._schema_version()
+                if version >= SCHEMA_VERSION:
+                    return
+
+                for step in range(version + 1, SCHEMA_VERSION + 1):
+                    for statement in _split_statements(_MIGRATIONS[step]):
+                        conn.execute(statement)
+
+                # Refresh planner statistics so the new indexes are used
+                conn.execute("ANALYZE")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
-            conn.commit()
             logging.info("Database initialized successfully")
 
+    def _schema_version(self) -> int:
+        """
+        Read the schema version of the database.
+
+        Returns:
+            Value of ``PRAGMA user_version``
+        """
+        return self._conn.execute("PRAGMA user_version").fetchone()[0]
+
     def add_image(
         self, filename: str, file_path: str, description: Optional[str] = None
     ) -> int:
@@ -165,16 +560,9 @@ class ClosetDatabase:
         Returns:
             ID of the created image record
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO images (filename, file_path, description)
-                VALUES (?, ?, ?)
-            """,
-                (filename, file_path, description),
-            )
-            conn.commit()
+            cursor.execute(_SQL_INSERT_IMAGE, (filename, file_path, description))
             return cursor.lastrowid
 
     def get_image(self, image_id: int) -> Optional[Dict[str, Any]]:
@@ -187,42 +575,25 @@ class ClosetDatabase:
         Returns:
             Dictionary containing image data with categories and tags, or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+        with self._reader() as conn:
+            image_row = conn.execute(_SQL_GET_IMAGE, (image_id,)).fetchone()
 
-            # Get image data
-            cursor.execute("SELECT * FROM images WHERE id = ?", (image_id,))
-            image_row = cursor.fetchone()
+        return _image_from_row(image_row) if image_row else None
 
-            if not image_row:
-                return None
+    def get_image_by_filename(self, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an image by filename with its categories and tags.
 
-            # Get categories
-            cursor.execute(
-                """
-                SELECT c.id, c.name, c.description
-                FROM categories c
-                JOIN image_categories ic ON c.id = ic.category_id
-                WHERE ic.image_id = ?
-            """,
-                (image_id,),
-            )
-            categories = [dict(row) for row in cursor.fetchall()]
-
-            # Get tags
-            cursor.execute(
-                """
-                SELECT t.id, t.name
-                FROM tags t
-                JOIN image_tags it ON t.id = it.tag_id
-                WHERE it.image_id = ?
-            """,
-                (image_id,),
-            )
-            tags = [dict(row) for row in cursor.fetchall()]
+        Args:
+            filename: Name of the image file
+
+        Returns:
+            Dictionary containing image data with categories and tags, or None if not found
+        """
+        with self._reader() as conn:
+            image_row = conn.execute(_SQL_GET_IMAGE_BY_FILENAME, (filename,)).fetchone()
 
-            return {**dict(image_row), "categories": categories, "tags": tags}
+        return _image_from_row(image_row) if image_row else None
 
     def get_all_images(self) -> List[Dict[str, Any]]:
         """
@@ -231,45 +602,21 @@ class ClosetDatabase:
         Returns:
             List of dictionaries containing image data with categories and tags
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+        return list(self.iter_all_images())
+
+    def iter_all_images(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all images with their categories and tags, newest first.
 
-            cursor.execute("SELECT * FROM images ORDER BY created_at DESC")
-            images = []
-
-            for image_row in cursor.fetchall():
-                image_id = image_row["id"]
-
-                # Get categories for this image
-                cursor.execute(
-                    """
-                    SELECT c.id, c.name, c.description
-                    FROM categories c
-                    JOIN image_categories ic ON c.id = ic.category_id
-                    WHERE ic.image_id = ?
-                """,
-                    (image_id,),
-                )
-                categories = [dict(row) for row in cursor.fetchall()]
-
-                # Get tags for this image
-                cursor.execute(
-                    """
-                    SELECT t.id, t.name
-                    FROM tags t
-                    JOIN image_tags it ON t.id = it.tag_id
-                    WHERE it.image_id = ?
-                """,
-                    (image_id,),
-                )
-                tags = [dict(row) for row in cursor.fetchall()]
-
-                images.append(
-                    {**dict(image_row), "categories": categories, "tags": tags}
-                )
-
-            return images
+        A pooled read-only connection is held until the generator is
+        exhausted or closed.
+
+        Yields:
+            Dictionaries containing image data with categories and tags
+        """
+        with self._reader() as conn:
+            for image_row in conn.execute(_SQL_GET_ALL_IMAGES):
+                yield _image_from_row(image_row)
 
     def add_category(self, name: str, description: Optional[str] = None) -> int:
         """
@@ -282,19 +629,18 @@ class ClosetDatabase:
         Returns:
             ID of the created category record
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
+            self._reference_cache.pop(_SQL_GET_CATEGORIES, None)
+
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR IGNORE INTO categories (name, description)
-                VALUES (?, ?)
-            """,
-                (name, description),
-            )
-            conn.commit()
+            if SUPPORTS_RETURNING:
+                cursor.execute(_SQL_UPSERT_CATEGORY, (name, description))
+                return cursor.fetchone()[0]
+
+            cursor.execute(_SQL_INSERT_CATEGORY, (name, description))
 
             # Get the ID of the category (existing or newly created)
-            cursor.execute("SELECT id FROM categories WHERE name = ?", (name,))
+            cursor.execute(_SQL_GET_CATEGORY_ID, (name,))
             return cursor.fetchone()[0]
 
     def add_tag(self, name: str) -> int:
@@ -307,19 +653,18 @@ class ClosetDatabase:
         Returns:
             ID of the created tag record
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
+            self._reference_cache.pop(_SQL_GET_TAGS, None)
+
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT OR IGNORE INTO tags (name)
-                VALUES (?)
-            """,
-                (name,),
-            )
-            conn.commit()
+            if SUPPORTS_RETURNING:
+                cursor.execute(_SQL_UPSERT_TAG, (name,))
+                return cursor.fetchone()[0]
+
+            cursor.execute(_SQL_INSERT_TAG, (name,))
 
             # Get the ID of the tag (existing or newly created)
-            cursor.execute("SELECT id FROM tags WHERE name = ?", (name,))
+            cursor.execute(_SQL_GET_TAG_ID, (name,))
             return cursor.fetchone()[0]
 
     def assign_category_to_image(self, image_id: int, category_id: int) -> bool:
@@ -333,21 +678,28 @@ class ClosetDatabase:
         Returns:
             True if successful, False if already exists
         """
-        with sqlite3.connect(self.db_path) as conn:
+        return self.assign_categories_to_image(image_id, [category_id]) == 1
+
+    def assign_categories_to_image(
+        self, image_id: int, category_ids: Sequence[int]
+    ) -> int:
+        """
+        Assign several categories to an image in a single transaction.
+
+        Args:
+            image_id: ID of the image
+            category_ids: IDs of the categories
+
+        Returns:
+            Number of categories newly assigned; existing assignments are skipped
+        """
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            try:
-                cursor.execute(
-                    """
-                    INSERT INTO image_categories (image_id, category_id)
-                    VALUES (?, ?)
-                """,
-                    (image_id, category_id),
-                )
-                conn.commit()
-                return True
-            except sqlite3.IntegrityError:
-                # Already exists
-                return False
+            cursor.executemany(
+                _SQL_ASSIGN_CATEGORY,
+                [(image_id, category_id) for category_id in category_ids],
+            )
+            return cursor.rowcount
 
     def assign_tag_to_image(self, image_id: int, tag_id: int) -> bool:
         """
@@ -360,21 +712,25 @@ class ClosetDatabase:
         Returns:
             True if successful, False if already exists
         """
-        with sqlite3.connect(self.db_path) as conn:
+        return self.assign_tags_to_image(image_id, [tag_id]) == 1
+
+    def assign_tags_to_image(self, image_id: int, tag_ids: Sequence[int]) -> int:
+        """
+        Assign several tags to an image in a single transaction.
+
+        Args:
+            image_id: ID of the image
+            tag_ids: IDs of the tags
+
+        Returns:
+            Number of tags newly assigned; existing assignments are skipped
+        """
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            try:
-                cursor.execute(
-                    """
-                    INSERT INTO image_tags (image_id, tag_id)
-                    VALUES (?, ?)
-                """,
-                    (image_id, tag_id),
-                )
-                conn.commit()
-                return True
-            except sqlite3.IntegrityError:
-                # Already exists
-                return False
+            cursor.executemany(
+                _SQL_ASSIGN_TAG, [(image_id, tag_id) for tag_id in tag_ids]
+            )
+            return cursor.rowcount
 
     def update_image_description(self, image_id: int, description: str) -> bool:
         """
@@ -387,17 +743,9 @@ class ClosetDatabase:
         Returns:
             True if successful, False if image not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE images 
-                SET description = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """,
-                (description, image_id),
-            )
-            conn.commit()
+            cursor.execute(_SQL_UPDATE_IMAGE_DESCRIPTION, (description, image_id))
             return cursor.rowcount > 0
 
     def get_categories(self) -> List[Dict[str, Any]]:
@@ -407,11 +755,7 @@ class ClosetDatabase:
         Returns:
             List of category dictionaries
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM categories ORDER BY name")
-            return [dict(row) for row in cursor.fetchall()]
+        return self._cached_rows(_SQL_GET_CATEGORIES)
 
     def get_tags(self) -> List[Dict[str, Any]]:
         """
@@ -420,11 +764,7 @@ class ClosetDatabase:
         Returns:
             List of tag dictionaries
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM tags ORDER BY name")
-            return [dict(row) for row in cursor.fetchall()]
+        return self._cached_rows(_SQL_GET_TAGS)
 
     def search_images_by_category(self, category_name: str) -> List[Dict[str, Any]]:
         """
@@ -436,54 +776,26 @@ class ClosetDatabase:
         Returns:
             List of image dictionaries matching the category
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+        with self._reader() as conn:
+            row = conn.execute(_SQL_GET_CATEGORY_ID, (category_name,)).fetchone()
 
-            cursor.execute(
-                """
-                SELECT DISTINCT i.*
-                FROM images i
-                JOIN image_categories ic ON i.id = ic.image_id
-                JOIN categories c ON ic.category_id = c.id
-                WHERE c.name = ?
-                ORDER BY i.created_at DESC
-            """,
-                (category_name,),
-            )
+        return self.search_images_by_category_id(row[0]) if row else []
+
+    def search_images_by_category_id(self, category_id: int) -> List[Dict[str, Any]]:
+        """
+        Search for images by category ID.
+
+        Args:
+            category_id: ID of the category to search for
+
+        Returns:
+            List of image dictionaries matching the category
+        """
+        with self._reader() as conn:
+            cursor = conn.execute(_SQL_SEARCH_IMAGES_BY_CATEGORY_ID, (category_id,))
+            image_rows = cursor.fetchall()
 
-            images = []
-            for image_row in cursor.fetchall():
-                image_id = image_row["id"]
-
-                # Get categories and tags for each image
-                cursor.execute(
-                    """
-                    SELECT c.id, c.name, c.description
-                    FROM categories c
-                    JOIN image_categories ic ON c.id = ic.category_id
-                    WHERE ic.image_id = ?
-                """,
-                    (image_id,),
-                )
-                categories = [dict(row) for row in cursor.fetchall()]
-
-                cursor.execute(
-                    """
-                    SELECT t.id, t.name
-                    FROM tags t
-                    JOIN image_tags it ON t.id = it.tag_id
-                    WHERE it.image_id = ?
-                """,
-                    (image_id,),
-                )
-                tags = [dict(row) for row in cursor.fetchall()]
-
-                images.append(
-                    {**dict(image_row), "categories": categories, "tags": tags}
-                )
-
-            return images
+        return [_image_from_row(image_row) for image_row in image_rows]
 
     def populate_existing_images(self, output_folder: Path) -> int:
         """
@@ -498,25 +810,24 @@ class ClosetDatabase:
         if not output_folder.exists():
             return 0
 
-        added_count = 0
-        for image_path in output_folder.glob("*.png"):
-            # Check if image already exists in database
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT id FROM images WHERE filename = ?", (image_path.name,)
-                )
-                if cursor.fetchone():
-                    continue  # Image already exists, skip
+        with self._transaction() as conn:
+            # Load known filenames once instead of querying per file
+            existing = {row[0] for row in conn.execute(_SQL_GET_ALL_FILENAMES)}
 
-            # Add image to database
-            # image_id = self.add_image(
-            #     filename=image_path.name, file_path=str(image_path), description=None
-            # )
+            # scandir reads names and types from the directory listing itself,
+            # so non-matching entries are skipped without a stat call
+            with os.scandir(output_folder) as entries:
+                rows = [
+                    (entry.name, entry.path, None)
+                    for entry in entries
+                    if entry.name.endswith(".png")
+                    and entry.name not in existing
+                    and entry.is_file(follow_symlinks=False)
+                ]
 
-            added_count += 1
+            conn.executemany(_SQL_INSERT_IMAGE, rows)
 
-        return added_count
+        return len(rows)
 
     def add_outfit(
         self, filename: str, file_path: str, description: Optional[str] = None
@@ -532,16 +843,9 @@ class ClosetDatabase:
         Returns:
             ID of the created outfit record
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO outfits (filename, file_path, description)
-                VALUES (?, ?, ?)
-            """,
-                (filename, file_path, description),
-            )
-            conn.commit()
+            cursor.execute(_SQL_INSERT_OUTFIT, (filename, file_path, description))
             return cursor.lastrowid
 
     def get_outfit(self, outfit_id: int) -> Optional[Dict[str, Any]]:
@@ -554,31 +858,14 @@ class ClosetDatabase:
         Returns:
             Dictionary containing outfit data with associated items, or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
+        with self._reader() as conn:
             # Get outfit data
-            cursor.execute("SELECT * FROM outfits WHERE id = ?", (outfit_id,))
-            outfit_row = cursor.fetchone()
+            outfit_row = conn.execute(_SQL_GET_OUTFIT, (outfit_id,)).fetchone()
 
             if not outfit_row:
                 return None
 
-            # Get associated clothing items
-            cursor.execute(
-                """
-                SELECT i.id, i.filename, i.file_path, i.description, i.created_at
-                FROM images i
-                JOIN outfit_items oi ON i.id = oi.image_id
-                WHERE oi.outfit_id = ?
-                ORDER BY i.created_at
-            """,
-                (outfit_id,),
-            )
-            items = [dict(row) for row in cursor.fetchall()]
-
-            return {**dict(outfit_row), "items": items}
+            return self._attach_outfit_items(conn, [outfit_row], [outfit_id])[0]
 
     def get_all_outfits(self) -> List[Dict[str, Any]]:
         """
@@ -587,32 +874,62 @@ class ClosetDatabase:
         Returns:
             List of dictionaries containing outfit data with associated items
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+        return list(self.iter_all_outfits())
 
-            cursor.execute("SELECT * FROM outfits ORDER BY created_at DESC")
-            outfits = []
+    def iter_all_outfits(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all outfits with their associated clothing items, newest first.
 
-            for outfit_row in cursor.fetchall():
-                outfit_id = outfit_row["id"]
+        A pooled read-only connection is held until the generator is
+        exhausted or closed.
 
-                # Get associated clothing items
-                cursor.execute(
-                    """
-                    SELECT i.id, i.filename, i.file_path, i.description, i.created_at
-                    FROM images i
-                    JOIN outfit_items oi ON i.id = oi.image_id
-                    WHERE oi.outfit_id = ?
-                    ORDER BY i.created_at
-                """,
-                    (outfit_id,),
-                )
-                items = [dict(row) for row in cursor.fetchall()]
+        Yields:
+            Dictionaries containing outfit data with associated items
+        """
+        with self._reader() as conn:
+            items = self._fetch_outfit_items(conn)
+            for outfit_row in conn.execute(_SQL_GET_ALL_OUTFITS):
+                yield {**dict(outfit_row), "items": items.get(outfit_row["id"], [])}
 
-                outfits.append({**dict(outfit_row), "items": items})
+    def _fetch_outfit_items(
+        self, conn: sqlite3.Connection, outfit_ids: Optional[List[int]] = None
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Fetch the clothing items of outfits using a single query.
 
-            return outfits
+        Args:
+            conn: Connection to run the query on
+            outfit_ids: IDs to fetch items for, or None to fetch them for all outfits
+
+        Returns:
+            Clothing items keyed by outfit ID
+        """
+        where, params = _id_filter("oi.outfit_id", outfit_ids)
+        return _fetch_grouped(conn, _SQL_OUTFIT_ITEMS.format(where=where), params)
+
+    def _attach_outfit_items(
+        self,
+        conn: sqlite3.Connection,
+        outfit_rows: List[sqlite3.Row],
+        outfit_ids: Optional[List[int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Combine outfit rows with their clothing items using a single query.
+
+        Args:
+            conn: Connection to run the query on
+            outfit_rows: Outfit rows to hydrate
+            outfit_ids: IDs to fetch items for, or None to fetch them for all outfits
+
+        Returns:
+            List of dictionaries containing outfit data with associated items
+        """
+        items = self._fetch_outfit_items(conn, outfit_ids)
+
+        return [
+            {**dict(outfit_row), "items": items.get(outfit_row["id"], [])}
+            for outfit_row in outfit_rows
+        ]
 
     def add_item_to_outfit(self, outfit_id: int, image_id: int) -> bool:
         """
@@ -625,21 +942,25 @@ class ClosetDatabase:
         Returns:
             True if successful, False if already exists
         """
-        with sqlite3.connect(self.db_path) as conn:
+        return self.add_items_to_outfit(outfit_id, [image_id]) == 1
+
+    def add_items_to_outfit(self, outfit_id: int, image_ids: Sequence[int]) -> int:
+        """
+        Add several clothing items to an outfit in a single transaction.
+
+        Args:
+            outfit_id: ID of the outfit
+            image_ids: IDs of the clothing items
+
+        Returns:
+            Number of items newly added; items already in the outfit are skipped
+        """
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            try:
-                cursor.execute(
-                    """
-                    INSERT INTO outfit_items (outfit_id, image_id)
-                    VALUES (?, ?)
-                """,
-                    (outfit_id, image_id),
-                )
-                conn.commit()
-                return True
-            except sqlite3.IntegrityError:
-                # Already exists
-                return False
+            cursor.executemany(
+                _SQL_ADD_OUTFIT_ITEM, [(outfit_id, image_id) for image_id in image_ids]
+            )
+            return cursor.rowcount
 
     def remove_item_from_outfit(self, outfit_id: int, image_id: int) -> bool:
         """
@@ -652,16 +973,9 @@ class ClosetDatabase:
         Returns:
             True if successful, False if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                DELETE FROM outfit_items 
-                WHERE outfit_id = ? AND image_id = ?
-            """,
-                (outfit_id, image_id),
-            )
-            conn.commit()
+            cursor.execute(_SQL_REMOVE_OUTFIT_ITEM, (outfit_id, image_id))
             return cursor.rowcount > 0
 
     def update_outfit_description(self, outfit_id: int, description: str) -> bool:
@@ -675,15 +989,7 @@ class ClosetDatabase:
         Returns:
             True if successful, False if outfit not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                UPDATE outfits 
-                SET description = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """,
-                (description, outfit_id),
-            )
-            conn.commit()
+            cursor.execute(_SQL_UPDATE_OUTFIT_DESCRIPTION, (description, outfit_id))
             return cursor.rowcount > 0
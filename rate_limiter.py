@@ -0,0 +1,93 @@
+"""
+Token-bucket rate limiting for Gemini API calls.
+
+Gemini enforces quotas on both requests per minute (RPM) and tokens per minute
+(TPM). Sleeping for the known refill time before a call is far cheaper than
+paying a full round-trip for a 429 response and retrying.
+"""
+
+import threading
+import time
+
+
+def estimate_tokens(prompt: str, image_size: int) -> int:
+    """
+    Estimate the number of input tokens for a Gemini request.
+
+    Args:
+        prompt: Prompt text sent with the request
+        image_size: Total size in bytes of the images sent with the request
+
+    Returns:
+        Conservative estimate of the token count
+    """
+    return len(prompt) // 4 + image_size // 1024
+
+
+class TokenBucket:
+    """Limits call rate to a requests-per-minute and tokens-per-minute budget."""
+
+    def __init__(self, rpm: int = 0, tpm: int = 0):
+        """
+        Initialize the token bucket with full capacity.
+
+        Args:
+            rpm: Maximum requests per minute, or 0 for no request limit
+            tpm: Maximum tokens per minute, or 0 for no token limit
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.request_tokens = float(rpm)
+        self.token_tokens = float(tpm)
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update, capped at capacity."""
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+
+        if self.rpm > 0:
+            self.request_tokens = min(
+                self.rpm, self.request_tokens + elapsed * self.rpm / 60
+            )
+        if self.tpm > 0:
+            self.token_tokens = min(
+                self.tpm, self.token_tokens + elapsed * self.tpm / 60
+            )
+
+    def acquire(self, estimated_tokens: int = 0) -> None:
+        """
+        Block until one request and the estimated tokens are available.
+
+        Args:
+            estimated_tokens: Expected token usage of the request
+        """
+        if self.rpm <= 0 and self.tpm <= 0:
+            return
+
+        # A single request can never need more than the full bucket
+        if self.tpm > 0:
+            estimated_tokens = min(estimated_tokens, self.tpm)
+
+        while True:
+            with self._lock:
+                self._refill()
+
+                wait = 0.0
+                if self.rpm > 0 and self.request_tokens < 1:
+                    wait = (1 - self.request_tokens) * 60 / self.rpm
+                if self.tpm > 0 and self.token_tokens < estimated_tokens:
+                    wait = max(
+                        wait, (estimated_tokens - self.token_tokens) * 60 / self.tpm
+                    )
+
+                if wait == 0:
+                    if self.rpm > 0:
+                        self.request_tokens -= 1
+                    if self.tpm > 0:
+                        self.token_tokens -= estimated_tokens
+                    return
+
+            time.sleep(wait)
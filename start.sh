@@ -7,5 +7,13 @@ mkdir -p images/input images/output images/archive
 export FLASK_APP=app.py
 export FLASK_ENV=production
 
-# Start with Gunicorn for production
-exec gunicorn --bind 0.0.0.0:5000 --workers 2 --timeout 120 --keep-alive 2 --max-requests 1000 --max-requests-jitter 100 app:app
+# Start with Gunicorn for production.
+# Requests spend most of their time waiting on Gemini, so threads scale better
+# than processes. Queued /process jobs are tracked in memory, so keep a single
+# worker process unless job status polling is moved to shared storage.
+exec gunicorn --bind 0.0.0.0:5000 \
+    --worker-class gthread \
+    --workers "${GUNICORN_WORKERS:-1}" \
+    --threads "${GUNICORN_THREADS:-8}" \
+    --timeout 120 --keep-alive 2 --max-requests 1000 --max-requests-jitter 100 \
+    app:app